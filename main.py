@@ -4,49 +4,113 @@ This CLI tool checks aurora visibility and sends email notifications
 when conditions are favorable for viewing the Northern Lights.
 """
 
+import argparse
 import sys
 
-from utils.cli_commands import configure, test_email, list_config, check
-from utils.logger import setup_logger
+
+def _cmd_configure(args: argparse.Namespace) -> None:
+    """Run the interactive configuration setup."""
+    from utils.cli_commands import configure
+    configure()
+
+
+def _cmd_list(args: argparse.Namespace) -> None:
+    """Show the current configuration."""
+    from utils.cli_commands import list_config
+    list_config()
+
+
+def _cmd_check(args: argparse.Namespace) -> None:
+    """Check aurora visibility with the parsed options."""
+    from utils.cli_commands import check
+    check(
+        save_output=args.save_output,
+        no_cache=args.no_cache,
+        warm=not args.no_warm,
+        per_location=args.per_location,
+    )
+
+
+def _cmd_test_email(args: argparse.Namespace) -> None:
+    """Send a test email to the configured recipients."""
+    from utils.cli_commands import test_email
+    test_email()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser.
+
+    Each subcommand stores its handler, which imports the command
+    implementation on call to keep startup light.
+
+    Returns:
+        Configured argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python main.py",
+        description="Aurora Borealis visibility tracker.",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+
+    p_configure = subparsers.add_parser(
+        "configure", help="Set up your locations and email settings"
+    )
+    p_configure.set_defaults(handler=_cmd_configure)
+
+    p_list = subparsers.add_parser(
+        "list", help="Show current configuration"
+    )
+    p_list.set_defaults(handler=_cmd_list)
+
+    p_check = subparsers.add_parser(
+        "check", help="Check aurora visibility at all locations"
+    )
+    p_check.add_argument(
+        "--save-output",
+        metavar="FILE",
+        help="Save raw API responses to file",
+    )
+    p_check.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore API responses cached by a recent run",
+    )
+    p_check.add_argument(
+        "--no-warm",
+        action="store_true",
+        help="Don't pre-open the API connection before fetching",
+    )
+    p_check.add_argument(
+        "--per-location",
+        action="store_true",
+        help="Query the API once per location instead of once in total",
+    )
+    p_check.set_defaults(handler=_cmd_check)
+
+    p_test_email = subparsers.add_parser(
+        "test-email", help="Send a test email to verify SMTP configuration"
+    )
+    p_test_email.set_defaults(handler=_cmd_test_email)
+
+    return parser
 
 
 def main() -> None:
     """Main entry point for the CLI."""
-    # Initialize logging
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+
+    # Initialize logging only once a command is actually going to run
+    from utils.logger import flush_logs, setup_logger
     setup_logger()
-    if not sys.argv[1:]:
-        sys.exit(
-            "Usage: python main.py <command> [options]\n\n"
-            "Commands:\n"
-            "  configure   - Set up your locations and email settings\n"
-            "  list        - Show current configuration\n"
-            "  check       - Check aurora visibility at all locations\n"
-            "  test-email  - Send a test email to verify SMTP configuration\n\n"
-            "Options for 'check' command:\n"
-            "  --save-output <file>  - Save raw API responses to file"
-        )
-
-    command = sys.argv[1]
-    if command == "configure":
-        configure()
-    elif command == "list":
-        list_config()
-    elif command == "check":
-        # Parse optional --save-output flag
-        save_output = None
-        if len(sys.argv) > 2 and sys.argv[2] == "--save-output":
-            if len(sys.argv) > 3:
-                save_output = sys.argv[3]
-            else:
-                sys.exit("Error: --save-output requires a file path argument")
-        check(save_output=save_output)
-    elif command == "test-email":
-        test_email()
-    else:
-        sys.exit(
-            f"Invalid command: {command}\n"
-            "Valid commands: configure, list, check, test-email"
-        )
+    try:
+        args.handler(args)
+    finally:
+        # Write queued records before any exit message
+        flush_logs()
 
 
 if __name__ == "__main__":
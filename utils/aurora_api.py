@@ -1,64 +1,343 @@
 """Client for Auroras.live API."""
 
+import contextlib
+import functools
 import json
+import math
+import os
 import sys
-from typing import Dict, Any, Optional
+import tempfile
+import threading
+import time
+from typing import Dict, Any, IO, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from utils.logger import get_logger
 
 AURORAS_API = "http://api.auroras.live/v1/"
 
+# On-disk response cache shared by consecutive runs (e.g. from cron)
+RESPONSE_CACHE = ".aurora_cache.json"
+RESPONSE_CACHE_TTL = 180  # seconds; KP data updates every few minutes
+
 logger = get_logger("aurora_api")
 
+# Serializes save_fp writes when locations are fetched concurrently
+_SAVE_LOCK = threading.Lock()
 
-def fetch_aurora_data(
+# One lock per coordinate bucket, so concurrent fetches of the same
+# bucket wait for the first instead of each sending a request
+_BUCKET_LOCKS: Dict[Tuple[float, float, str, bool], threading.Lock] = {}
+_BUCKET_LOCKS_LOCK = threading.Lock()
+
+# Loaded lazily from RESPONSE_CACHE; maps request key -> entry
+_DISK_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+_DISK_CACHE_DIRTY = False
+_DISK_CACHE_LOCK = threading.Lock()
+
+# Upper bound on concurrent API requests; the connection pool is sized
+# to match so concurrent fetches never discard pooled connections
+MAX_CONCURRENT_REQUESTS = 8
+
+# Shared session so keep-alive reuses one connection across locations
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=MAX_CONCURRENT_REQUESTS,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+    ),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+def _cache_path() -> str:
+    """Return the path of the on-disk response cache."""
+    return os.path.join(os.getcwd(), RESPONSE_CACHE)
+
+
+def _disk_cache() -> Dict[str, Dict[str, Any]]:
+    """Return the on-disk response cache, loading it on first use.
+
+    Must be called with _DISK_CACHE_LOCK held.
+
+    Returns:
+        Mapping of request key to {"expires": float, "body": str}
+    """
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        try:
+            with open(_cache_path(), "r") as f:
+                _DISK_CACHE = json.load(f)
+            if not isinstance(_DISK_CACHE, dict):
+                _DISK_CACHE = {}
+        except (OSError, ValueError):
+            _DISK_CACHE = {}
+    return _DISK_CACHE
+
+
+def _cache_ttl(response: requests.Response) -> float:
+    """Get how long a response may be cached, in seconds.
+
+    Honors a Cache-Control max-age directive when the server sends one,
+    otherwise falls back to RESPONSE_CACHE_TTL.
+
+    Args:
+        response: API response
+
+    Returns:
+        Time to live in seconds (0 means do not cache)
+    """
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    for directive in cache_control.split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-age":
+            try:
+                return max(0, int(value))
+            except ValueError:
+                break
+    return RESPONSE_CACHE_TTL
+
+
+def _store_disk_cache(key: str, response: requests.Response) -> None:
+    """Add a response to the on-disk cache (persisted on close_session).
+
+    Args:
+        key: Request cache key
+        response: Successful API response
+    """
+    global _DISK_CACHE_DIRTY
+    ttl = _cache_ttl(response)
+    if not ttl:
+        return
+    try:
+        body = response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        return
+    with _DISK_CACHE_LOCK:
+        _disk_cache()[key] = {"expires": time.time() + ttl, "body": body}
+        _DISK_CACHE_DIRTY = True
+
+
+def _cached_body(key: str) -> Optional[str]:
+    """Return an unexpired response body from the on-disk cache.
+
+    Args:
+        key: Request cache key
+
+    Returns:
+        Cached JSON body, or None on a miss
+    """
+    with _DISK_CACHE_LOCK:
+        entry = _disk_cache().get(key)
+    if entry and entry.get("expires", 0) > time.time():
+        return entry["body"]
+    return None
+
+
+def is_cached(
     latitude: float,
     longitude: float,
-    save_output: Optional[str] = None
-) -> Dict[str, Any]:
-    """Fetch aurora visibility data from Auroras.live API.
+    fields: str = "ace"
+) -> bool:
+    """Check whether a recent response for a location is cached on disk.
+
+    Coordinates are rounded the same way as in fetch_aurora_data.
 
     Args:
         latitude: Location latitude
         longitude: Location longitude
-        save_output: Optional path to save raw API response
+        fields: Auroras.live request type ("ace" or "all")
 
     Returns:
-        Dictionary containing aurora data including KP index
+        True if fetching would be served from RESPONSE_CACHE
+    """
+    key = f"{fields}:{round(latitude, 1)}:{round(longitude, 1)}"
+    return _cached_body(key) is not None
+
+
+def _save_disk_cache() -> None:
+    """Write the response cache back to disk if it changed.
+
+    Expired entries are dropped, and the cache is written to a unique
+    temp file and moved into place, so concurrent runs never read or
+    publish a partial cache.
+    """
+    global _DISK_CACHE_DIRTY
+    with _DISK_CACHE_LOCK:
+        if not _DISK_CACHE_DIRTY or _DISK_CACHE is None:
+            return
+        now = time.time()
+        entries = {
+            key: entry for key, entry in _DISK_CACHE.items()
+            if entry.get("expires", 0) > now
+        }
+        path = _cache_path()
+        tmp_path = None
+        try:
+            # A unique temp file, so overlapping runs never share one
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, path)
+            _DISK_CACHE_DIRTY = False
+        except OSError as e:
+            logger.warning("Could not write response cache: %s", e)
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+
+@functools.lru_cache(maxsize=64)
+def _fetch_cached(
+    latitude: float,
+    longitude: float,
+    fields: str,
+    use_cache: bool = True
+) -> bytes:
+    """Fetch the raw API response for a coordinate bucket.
+
+    Results are memoized for the lifetime of the process, so locations
+    that round to the same bucket share a single HTTP request. Unless
+    use_cache is False, responses are also kept in RESPONSE_CACHE for
+    RESPONSE_CACHE_TTL seconds so back-to-back runs skip the network.
+
+    Args:
+        latitude: Latitude rounded to one decimal place
+        longitude: Longitude rounded to one decimal place
+        fields: Auroras.live request type ("ace" or "all")
+        use_cache: Whether to read from the on-disk cache
+
+    Returns:
+        Raw JSON response body as bytes
 
     Raises:
-        SystemExit: If API request fails
+        requests.exceptions.RequestException: If the API request fails
     """
     params = {
-        "type": "all",
+        "type": fields,
         "lat": latitude,
         "long": longitude,
         "forecast": "false",
         "threeday": "false",
     }
+    if fields == "ace":
+        params["data"] = "all"
+
+    key = f"{fields}:{latitude}:{longitude}"
+    if use_cache:
+        body = _cached_body(key)
+        if body is not None:
+            logger.debug(
+                "Using cached aurora data for lat=%s, lon=%s",
+                latitude, longitude
+            )
+            return body.encode()
+
+    logger.debug(
+        "Fetching aurora data for lat=%s, lon=%s", latitude, longitude
+    )
+    response = _SESSION.get(AURORAS_API, params=params, timeout=10)
+    response.raise_for_status()
+    logger.debug("Aurora data fetched successfully")
+
+    _store_disk_cache(key, response)
+
+    # Raw bytes skip requests' charset detection; json.loads decodes UTF-8
+    return response.content
+
+
+def _fetch_bucket(
+    latitude: float,
+    longitude: float,
+    fields: str,
+    use_cache: bool
+) -> bytes:
+    """Fetch a coordinate bucket, sending at most one request for it.
+
+    lru_cache does not merge calls that are still in flight, so callers
+    for the same bucket take turns on its lock; all but the first are
+    then served from _fetch_cached's memo.
+
+    Args:
+        latitude: Latitude rounded to one decimal place
+        longitude: Longitude rounded to one decimal place
+        fields: Auroras.live request type ("ace" or "all")
+        use_cache: Whether to read from the on-disk cache
+
+    Returns:
+        Raw JSON response body as bytes
+
+    Raises:
+        requests.exceptions.RequestException: If the API request fails
+    """
+    key = (latitude, longitude, fields, use_cache)
+    with _BUCKET_LOCKS_LOCK:
+        lock = _BUCKET_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        return _fetch_cached(latitude, longitude, fields, use_cache)
+
+
+def fetch_aurora_data(
+    latitude: float,
+    longitude: float,
+    save_fp: Optional[IO[bytes]] = None,
+    fields: str = "ace",
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """Fetch aurora visibility data from Auroras.live API.
+
+    Coordinates are rounded to 0.1° and responses are cached per
+    bucket, so nearby locations reuse the same API response.
+
+    By default only the ACE data (which carries the KP index) is
+    requested. The full "all" payload is fetched when saving output,
+    since those dumps are meant for diagnostics.
+
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        save_fp: Optional binary file to append the raw response to
+        fields: Auroras.live request type (default: "ace")
+        use_cache: Whether to reuse recent responses from earlier runs
+
+    Returns:
+        Dictionary containing aurora data including KP index
+
+    Raises:
+        SystemExit: If API request fails
+    """
+    if save_fp:
+        fields = "all"
     try:
-        logger.debug(
-            f"Fetching aurora data for lat={latitude}, lon={longitude}"
+        data = json.loads(
+            _fetch_bucket(
+                round(latitude, 1), round(longitude, 1), fields, use_cache
+            )
         )
-        response = requests.get(AURORAS_API, params=params, timeout=10)
-        response.raise_for_status()
-        logger.debug("Aurora data fetched successfully")
-        data = response.json()
 
         # Save to file if requested
-        if save_output:
+        if save_fp:
             try:
-                with open(save_output, "a") as f:
-                    f.write(
-                        f"# Response for lat={latitude}, lon={longitude}\n"
-                    )
-                    f.write(json.dumps(data, indent=2))
-                    f.write("\n\n")
-                logger.info(f"API response saved to {save_output}")
+                entry = (
+                    f"# Response for lat={latitude}, lon={longitude}\n"
+                    f"{json.dumps(data, indent=2)}\n\n"
+                ).encode()
+                with _SAVE_LOCK:
+                    save_fp.write(entry)
+                logger.info("API response saved to %s", save_fp.name)
             except IOError as e:
-                logger.error(f"Failed to save API response: {e}")
+                logger.error("Failed to save API response: %s", e)
                 print(f"Warning: Could not save API output to file: {e}")
 
         return data
@@ -72,5 +351,90 @@ def fetch_aurora_data(
             "Check your internet connection."
         )
     except requests.exceptions.RequestException as e:
-        logger.error(f"Aurora API request failed: {e}")
+        logger.error("Aurora API request failed: %s", e)
         sys.exit(f"Error: Failed to fetch aurora data: {e}")
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON from aurora API: %s", e)
+        sys.exit(f"Error: Aurora API returned an invalid response: {e}")
+
+
+def extract_kp(data: Dict[str, Any]) -> Optional[float]:
+    """Extract the KP index from an aurora API response.
+
+    Handles both "all" responses, where ACE data is nested under
+    "ace", and "ace" responses, where it is the top-level object.
+
+    Args:
+        data: Decoded API response
+
+    Returns:
+        KP index, or None if the response does not contain one
+    """
+    ace = data.get("ace", data)
+    if not isinstance(ace, dict):
+        return None
+    kp_index = ace.get("kp")
+    if kp_index is None and isinstance(ace.get("current"), dict):
+        kp_index = ace["current"].get("kp")
+    if kp_index is None:
+        return None
+    try:
+        value = float(kp_index)
+    except (TypeError, ValueError):
+        value = math.nan
+    if not math.isfinite(value):
+        logger.warning("Unexpected KP value in API response: %r", kp_index)
+        return None
+    return value
+
+
+def fetch_global_kp(
+    latitude: float,
+    longitude: float,
+    save_fp: Optional[IO[bytes]] = None,
+    use_cache: bool = True
+) -> Optional[float]:
+    """Fetch the current global KP index with a single API request.
+
+    The KP index does not depend on the coordinates, so one request
+    (made for any representative point) serves every location.
+
+    Args:
+        latitude: Latitude to query
+        longitude: Longitude to query
+        save_fp: Optional binary file to append the raw response to
+        use_cache: Whether to reuse recent responses from earlier runs
+
+    Returns:
+        KP index, or None if the response does not contain one
+
+    Raises:
+        SystemExit: If API request fails
+    """
+    data = fetch_aurora_data(
+        latitude, longitude, save_fp=save_fp, use_cache=use_cache
+    )
+    return extract_kp(data)
+
+
+def warm_up() -> None:
+    """Open a pooled connection to the API in the background.
+
+    Sends a HEAD request on a daemon thread so the TCP handshake
+    overlaps with local work (loading the config) instead of delaying
+    the first real fetch. Failures are ignored; the real fetch reports
+    connection problems.
+    """
+    def _head() -> None:
+        try:
+            _SESSION.head(AURORAS_API, timeout=5)
+        except requests.exceptions.RequestException as e:
+            logger.debug("Connection warm-up failed: %s", e)
+
+    threading.Thread(target=_head, daemon=True).start()
+
+
+def close_session() -> None:
+    """Close the shared HTTP session and persist the response cache."""
+    _SESSION.close()
+    _save_disk_cache()
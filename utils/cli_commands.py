@@ -1,10 +1,16 @@
 """CLI command implementations for Northern Lights."""
 
 import os
-from typing import Dict, Any, List, Tuple
+import sys
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from statistics import fmean
+from typing import Dict, List, Tuple
 
 from utils.config import (
+    Location,
     load_config,
+    normalize_config,
     config_exists,
     display_config_summary,
     manage_locations,
@@ -13,12 +19,22 @@ from utils.config import (
     configure_smtp,
     setup_complete_config,
 )
-from utils.aurora_api import fetch_aurora_data
-from utils.email_notifier import send_email
-from utils.email_formatter import (
-    create_aurora_alert_email,
-    create_test_email
-)
+from utils.logger import flush_logs
+
+
+# Notification threshold setting -> (minimum KP, description)
+KP_THRESHOLDS: Dict[str, Tuple[float, str]] = {
+    "HIGH": (5.0, "KP >= 5.0"),
+    "MODERATE": (3.0, "KP >= 3.0"),
+    "ALL": (0.0, "KP > 0"),
+}
+
+# (minimum KP, status symbol, label), checked from highest to lowest
+VISIBILITY_LEVELS: List[Tuple[float, str, str]] = [
+    (5.0, "✓", "HIGH visibility!"),
+    (3.0, "○", "MODERATE visibility"),
+    (float("-inf"), " ", "LOW visibility"),
+]
 
 
 def configure() -> None:
@@ -29,8 +45,8 @@ def configure() -> None:
     # Check if config exists and load it
     config = {}
     if config_exists():
-        display_config_summary(load_config())
         config = load_config()
+        display_config_summary(config)
 
         print("\nWhat would you like to configure?")
         print("  1. Locations (city and country)")
@@ -88,12 +104,12 @@ def test_email() -> None:
     Raises:
         SystemExit: If no email addresses are configured
     """
-    config = load_config()
+    # Deferred so other commands don't pay for the email stack
+    from utils.email_notifier import send_bulk_email
+    from utils.email_formatter import create_test_email
 
-    # Support both old single email and new multiple emails format
-    emails = config.get(
-        "emails", [config.get("email")] if config.get("email") else []
-    )
+    config = normalize_config(load_config())
+    emails = config.emails
 
     if not emails:
         print("Error: No email addresses configured.")
@@ -105,24 +121,12 @@ def test_email() -> None:
     print("Testing email configuration...")
     print(f"Sending test email to: {', '.join(emails)}")
 
-    # Get locations for the email
-    locations = config.get("locations", [])
-    if not locations and "city" in config:
-        # Old format
-        locations = [{
-            "city": config["city"],
-            "country": config["country"],
-            "latitude": config["latitude"],
-            "longitude": config["longitude"]
-        }]
-
     # Generate formatted email
-    plain_body, html_body = create_test_email(locations)
+    plain_body, html_body = create_test_email(config.locations)
 
     subject = "Northern Lights - Email Test"
 
-    for email in emails:
-        send_email(email, subject, plain_body, html_body)
+    send_bulk_email(emails, subject, plain_body, html_body)
 
     print(
         f"\nTest email sent to {len(emails)} recipient(s)! Check your inbox."
@@ -134,83 +138,83 @@ def list_config() -> None:
 
     Shows all configured locations with their coordinates,
     email recipients, and SMTP configuration status.
-    Supports both old (single location/email) and new
-    (multiple locations/emails) configuration formats.
     """
     if not config_exists():
         print("No configuration file found.")
         print("Run 'uv run python main.py configure' to create one.")
         return
 
-    config = load_config()
+    config = normalize_config(load_config())
 
-    print("\n=== Current Configuration ===\n")
+    # Build the whole report and write it in one go
+    out: List[str] = ["", "=== Current Configuration ===", ""]
 
     # Show locations
-    if "locations" in config:
-        print(f"Locations ({len(config['locations'])}):")
-        for i, loc in enumerate(config["locations"], 1):
-            print(f"  {i}. {loc['city']}, {loc['country']}")
-            coords = f"{loc['latitude']:.4f}, {loc['longitude']:.4f}"
-            print(f"     Coordinates: {coords}")
-    elif "city" in config:
-        # Old single location format
-        print("Location:")
-        print(f"  {config['city']}, {config['country']}")
-        lat = config.get('latitude', 'N/A')
-        lng = config.get('longitude', 'N/A')
-        print(f"  Coordinates: {lat}, {lng}")
+    out.append(f"Locations ({len(config.locations)}):")
+    for i, loc in enumerate(config.locations, 1):
+        out.append(f"  {i}. {loc.city}, {loc.country}")
+        out.append(
+            f"     Coordinates: {loc.latitude:.4f}, {loc.longitude:.4f}"
+        )
 
     # Show emails
-    print()
-    if "emails" in config:
-        print(f"Email Recipients ({len(config['emails'])}):")
-        for i, email in enumerate(config["emails"], 1):
-            print(f"  {i}. {email}")
-    elif "email" in config:
-        print("Email Recipient:")
-        print(f"  {config['email']}")
+    out.append("")
+    if config.emails:
+        out.append(f"Email Recipients ({len(config.emails)}):")
+        for i, email in enumerate(config.emails, 1):
+            out.append(f"  {i}. {email}")
     else:
-        print("Email Recipients: (none configured)")
+        out.append("Email Recipients: (none configured)")
 
     # Show notification threshold
-    print()
-    threshold = config.get("notification_threshold", "HIGH")
-    print(f"Notification Threshold: {threshold}")
+    out.append("")
+    out.append(f"Notification Threshold: {config.notification_threshold}")
 
     # Show SMTP status
-    print()
+    out.append("")
     env_path = os.path.join(os.getcwd(), ".env")
     if os.path.exists(env_path):
-        print("SMTP Configuration: Configured (.env file found)")
+        out.append("SMTP Configuration: Configured (.env file found)")
     else:
-        print("SMTP Configuration: Not configured")
+        out.append("SMTP Configuration: Not configured")
 
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
-def check(save_output: str = None) -> None:
+def check(
+    save_output: str = None,
+    no_cache: bool = False,
+    warm: bool = True,
+    per_location: bool = False
+) -> None:
     """Check aurora visibility and send notification if HIGH.
 
+    The KP index is a global measure, so by default a single API
+    request is made and its KP value applies to every location.
+
     Args:
         save_output: Optional path to save raw API responses
+        no_cache: Skip API responses cached by a recent run
+        warm: Open the API connection early when a request is needed
+        per_location: Make one API request per location instead
 
     Sends email if visibility is HIGH at any configured location.
     """
-    config: Dict[str, Any] = load_config()
-
-    # Get locations (support both old and new format)
-    locations: List[Dict[str, Any]] = config.get("locations", [])
-    if not locations and "city" in config:
-        # Convert old single location format
-        locations = [
-            {
-                "city": config["city"],
-                "country": config["country"],
-                "latitude": config["latitude"],
-                "longitude": config["longitude"],
-            }
-        ]
+    # Deferred so other commands don't pay for the HTTP and email stacks
+    from utils.aurora_api import (
+        MAX_CONCURRENT_REQUESTS,
+        fetch_aurora_data,
+        fetch_global_kp,
+        extract_kp,
+        close_session,
+        is_cached,
+        warm_up,
+    )
+
+    config = normalize_config(load_config())
+    locations = config.locations
+    emails = config.emails
 
     if not locations:
         print(
@@ -219,10 +223,6 @@ def check(save_output: str = None) -> None:
         )
         return
 
-    # Get emails
-    emails: List[str] = config.get(
-        "emails", [config.get("email")] if config.get("email") else []
-    )
     if not emails:
         print(
             "Warning: No email addresses configured. "
@@ -230,61 +230,102 @@ def check(save_output: str = None) -> None:
         )
         return
 
-    # Get notification threshold
-    threshold = config.get("notification_threshold", "HIGH")
+    # The KP index is global, so by default one request at the
+    # locations' centroid covers every location
+    centroid = (
+        fmean(loc.latitude for loc in locations),
+        fmean(loc.longitude for loc in locations),
+    )
+    query_points = (
+        [(loc.latitude, loc.longitude) for loc in locations]
+        if per_location else [centroid]
+    )
+
+    # Open the API connection in the background while the email stack
+    # loads, unless every request will be served from the disk cache
+    fields = "all" if save_output else "ace"
+    if warm and (
+        no_cache
+        or not all(is_cached(lat, lon, fields) for lat, lon in query_points)
+    ):
+        warm_up()
+
+    from utils.email_notifier import send_bulk_email
+    from utils.email_formatter import create_aurora_alert_email
 
-    # Determine KP threshold based on setting
-    if threshold == "MODERATE":
-        kp_threshold = 3.0
-        threshold_desc = "KP >= 3.0"
-    elif threshold == "ALL":
-        kp_threshold = 0.0
-        threshold_desc = "KP > 0"
-    else:  # HIGH
-        kp_threshold = 5.0
-        threshold_desc = "KP >= 5.0"
+    threshold = config.notification_threshold
+
+    # Determine KP threshold based on setting (defaults to HIGH)
+    kp_threshold, threshold_desc = KP_THRESHOLDS.get(
+        threshold, KP_THRESHOLDS["HIGH"]
+    )
 
     print(
         f"Checking aurora visibility for {len(locations)} location(s)...\n"
         f"Notification threshold: {threshold} ({threshold_desc})\n"
     )
 
-    notification_locations: List[Tuple[Dict[str, Any], float]] = []
-
-    # Check each location
-    for loc in locations:
-        data = fetch_aurora_data(
-            loc["latitude"], loc["longitude"], save_output=save_output
-        )
+    notification_locations: List[Tuple[Location, float]] = []
+
+    with ExitStack() as stack:
+        # Open the output file once for the whole run
+        save_fp = None
+        if save_output:
+            try:
+                save_fp = stack.enter_context(open(save_output, "ab"))
+            except OSError as e:
+                print(f"Warning: Could not save API output to file: {e}")
+
+        if per_location:
+            # Fetch all locations concurrently; results keep the order
+            max_workers = min(MAX_CONCURRENT_REQUESTS, len(locations))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                kp_values = list(
+                    executor.map(
+                        lambda loc: extract_kp(
+                            fetch_aurora_data(
+                                loc.latitude,
+                                loc.longitude,
+                                save_fp=save_fp,
+                                use_cache=not no_cache,
+                            )
+                        ),
+                        locations,
+                    )
+                )
+        else:
+            # The KP index is global, so one request covers every location
+            global_kp = fetch_global_kp(
+                *centroid,
+                save_fp=save_fp,
+                use_cache=not no_cache,
+            )
+            kp_values = [global_kp] * len(locations)
 
-        # Try to get KP index from API response
-        kp_index = None
-        if "ace" in data:
-            kp_index = data["ace"].get("kp")
-            if kp_index is None and "current" in data["ace"]:
-                kp_index = data["ace"]["current"].get("kp")
+    close_session()
+    # Worker threads' log records come before the per-location results
+    flush_logs()
 
-        if kp_index is None:
-            location_name = f"{loc['city']}, {loc['country']}"
+    # Check each location
+    for loc, kp_value in zip(locations, kp_values):
+        if kp_value is None:
+            location_name = f"{loc.city}, {loc.country}"
             print(f"⚠ {location_name}: Unable to determine KP index")
             continue
 
-        kp_value = float(kp_index)
-
         # Print status
-        location_name = f"{loc['city']}, {loc['country']}"
-        if kp_value >= 5:
-            print(f"✓ {location_name}: KP {kp_value} - HIGH visibility!")
-            if kp_value >= kp_threshold:
-                notification_locations.append((loc, kp_value))
-        elif kp_value >= 3:
-            print(f"○ {location_name}: KP {kp_value} - MODERATE visibility")
-            if kp_value >= kp_threshold:
-                notification_locations.append((loc, kp_value))
-        else:
-            print(f"  {location_name}: KP {kp_value} - LOW visibility")
-            if kp_value > 0 and kp_value >= kp_threshold:
-                notification_locations.append((loc, kp_value))
+        location_name = f"{loc.city}, {loc.country}"
+        symbol, label = next(
+            (
+                (symbol, label)
+                for min_kp, symbol, label in VISIBILITY_LEVELS
+                if kp_value >= min_kp
+            ),
+            VISIBILITY_LEVELS[-1][1:],
+        )
+        print(f"{symbol} {location_name}: KP {kp_value} - {label}")
+        if kp_value > 0 and kp_value >= kp_threshold:
+            notification_locations.append((loc, kp_value))
 
     # Send notification if any location meets threshold
     if notification_locations:
@@ -298,7 +339,7 @@ def check(save_output: str = None) -> None:
         # Create subject line
         if len(notification_locations) == 1:
             loc, kp = notification_locations[0]
-            subject = f"Aurora Alert: Visibility at {loc['city']}"
+            subject = f"Aurora Alert: Visibility at {loc.city}"
         else:
             num_locs = len(notification_locations)
             subject = (
@@ -306,8 +347,7 @@ def check(save_output: str = None) -> None:
                 f"{num_locs} location(s)"
             )
 
-        for email in emails:
-            send_email(email, subject, plain_body, html_body)
+        send_bulk_email(emails, subject, plain_body, html_body)
 
         num_notified = len(notification_locations)
         print(f"Notification sent for {num_notified} location(s)!")
@@ -1,15 +1,50 @@
 """Configuration management for Northern Lights."""
 
+import copy
+import functools
 import json
 import os
 import re
 import sys
-from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from itertools import filterfalse
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-from utils.geocoding import get_coordinates
+from utils.geocoding import GeocodingError, cached_get_coordinates
 
 CONFIGURATION = "config.json"
 
+VALID_THRESHOLDS = ("HIGH", "MODERATE", "ALL")
+REQUIRED_LOCATION_KEYS = ("city", "country", "latitude", "longitude")
+# (key, absolute limit) for each coordinate, checked in one loop
+COORDINATE_LIMITS = (("latitude", 90), ("longitude", 180))
+
+# Last validated config, keyed on (path, mtime_ns, size); see load_config
+_CONFIG_CACHE: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+
+# Basic email pattern, compiled once and shared by every validation path
+# (used with fullmatch; re.ASCII keeps \w to [A-Za-z0-9_])
+_EMAIL_RE = re.compile(r'[\w.%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', re.ASCII)
+
+
+@dataclass(slots=True)
+class Location:
+    """A monitored location."""
+
+    city: str
+    country: str
+    latitude: float
+    longitude: float
+
+
+@dataclass(slots=True)
+class Config:
+    """Configuration normalized to the multi-location/email format."""
+
+    locations: List[Location] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    notification_threshold: str = "HIGH"
+
 
 def validate_email(email: str) -> bool:
     """Validate email address format.
@@ -20,140 +55,287 @@ def validate_email(email: str) -> bool:
     Returns:
         True if email is valid, False otherwise
     """
-    # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email.strip()))
+    return _EMAIL_RE.fullmatch(email.strip()) is not None
 
 
-def validate_config(config: Dict[str, Any]) -> List[str]:
-    """Validate configuration structure and contents.
+def _validate_location(number: int, loc: Any) -> List[str]:
+    """Validate a single entry of the 'locations' list.
 
     Args:
-        config: Configuration dictionary to validate
+        number: 1-based position of the location (for messages)
+        loc: Location entry to validate
 
     Returns:
         List of error messages (empty if valid)
     """
+    if not isinstance(loc, dict):
+        return [f"Location {number} must be a dictionary"]
+
     errors = []
+    missing = [k for k in REQUIRED_LOCATION_KEYS if k not in loc]
+    if missing:
+        errors.append(
+            f"Location {number} missing keys: {', '.join(missing)}"
+        )
+    # Validate coordinates
+    for key, limit in COORDINATE_LIMITS:
+        if key not in loc:
+            continue
+        try:
+            value = float(loc[key])
+        except (ValueError, TypeError):
+            errors.append(f"Location {number} {key} must be a number")
+            continue
+        if not -limit <= value <= limit:
+            errors.append(
+                f"Location {number} {key} must be "
+                f"between -{limit} and {limit}"
+            )
+    return errors
+
+
+def _validate_email_entry(email: Any) -> List[str]:
+    """Validate a single configured email address.
+
+    Args:
+        email: Email entry to validate
+
+    Returns:
+        List of error messages (empty if valid)
+    """
+    if not isinstance(email, str) or not validate_email(email):
+        return [f"Invalid email format: {email}"]
+    return []
+
+
+def _iter_config_errors(config: Any) -> Iterator[str]:
+    """Yield configuration errors lazily, in document order.
+
+    Args:
+        config: Configuration to validate
+
+    Yields:
+        Error messages
+    """
+    if not isinstance(config, dict):
+        yield "Configuration must be a JSON object"
+        return
 
     # Check notification threshold
     if "notification_threshold" in config:
-        threshold = config["notification_threshold"]
-        valid_thresholds = ["HIGH", "MODERATE", "ALL"]
-        if threshold not in valid_thresholds:
-            errors.append(
+        if config["notification_threshold"] not in VALID_THRESHOLDS:
+            yield (
                 f"notification_threshold must be one of: "
-                f"{', '.join(valid_thresholds)}"
+                f"{', '.join(VALID_THRESHOLDS)}"
             )
 
     # Check for locations (new format) or city/country (old format)
     if "locations" in config:
         if not isinstance(config["locations"], list):
-            errors.append("'locations' must be a list")
+            yield "'locations' must be a list"
         elif len(config["locations"]) == 0:
-            errors.append("At least one location must be configured")
+            yield "At least one location must be configured"
         else:
-            for i, loc in enumerate(config["locations"]):
-                if not isinstance(loc, dict):
-                    errors.append(f"Location {i+1} must be a dictionary")
-                    continue
-                required_keys = ["city", "country", "latitude", "longitude"]
-                missing = [k for k in required_keys if k not in loc]
-                if missing:
-                    errors.append(
-                        f"Location {i+1} missing keys: {', '.join(missing)}"
-                    )
-                # Validate coordinates
-                if "latitude" in loc:
-                    try:
-                        lat = float(loc["latitude"])
-                        if not -90 <= lat <= 90:
-                            errors.append(
-                                f"Location {i+1} latitude must be "
-                                f"between -90 and 90"
-                            )
-                    except (ValueError, TypeError):
-                        errors.append(
-                            f"Location {i+1} latitude must be a number"
-                        )
-                if "longitude" in loc:
-                    try:
-                        lng = float(loc["longitude"])
-                        if not -180 <= lng <= 180:
-                            errors.append(
-                                f"Location {i+1} longitude must be "
-                                f"between -180 and 180"
-                            )
-                    except (ValueError, TypeError):
-                        errors.append(
-                            f"Location {i+1} longitude must be a number"
-                        )
+            for i, loc in enumerate(config["locations"], 1):
+                yield from _validate_location(i, loc)
     elif "city" in config and "country" in config:
         # Old format - check for required coordinate fields
         if "latitude" not in config or "longitude" not in config:
-            errors.append(
-                "Old format config missing latitude or longitude"
-            )
+            yield "Old format config missing latitude or longitude"
+        else:
+            # The top level doubles as the single location
+            yield from _validate_location(1, config)
     else:
-        errors.append(
-            "Config must have either 'locations' or 'city'/'country'"
-        )
+        yield "Config must have either 'locations' or 'city'/'country'"
 
     # Check for emails (new format) or email (old format)
     if "emails" in config:
         if not isinstance(config["emails"], list):
-            errors.append("'emails' must be a list")
+            yield "'emails' must be a list"
         elif len(config["emails"]) == 0:
-            errors.append("At least one email must be configured")
+            yield "At least one email must be configured"
         else:
             for email in config["emails"]:
-                if not validate_email(email):
-                    errors.append(f"Invalid email format: {email}")
+                yield from _validate_email_entry(email)
     elif "email" in config:
-        if not validate_email(config["email"]):
-            errors.append(f"Invalid email format: {config['email']}")
+        yield from _validate_email_entry(config["email"])
     else:
-        errors.append("Config must have either 'emails' or 'email'")
+        yield "Config must have either 'emails' or 'email'"
 
-    return errors
+
+def validate_config(
+    config: Dict[str, Any],
+    fast: bool = False
+) -> List[str]:
+    """Validate configuration structure and contents.
+
+    Args:
+        config: Configuration dictionary to validate
+        fast: Stop at the first error instead of collecting them all
+            (for callers that reject any invalid config outright)
+
+    Returns:
+        List of error messages (empty if valid)
+    """
+    errors = _iter_config_errors(config)
+    if fast:
+        first = next(errors, None)
+        return [first] if first is not None else []
+    return list(errors)
+
+
+@functools.lru_cache(maxsize=1)
+def _config_path() -> str:
+    """Return the path of config.json in the working directory.
+
+    Resolved once per process; call _config_path.cache_clear() after
+    changing directory.
+    """
+    return os.path.join(os.getcwd(), CONFIGURATION)
 
 
-def load_config() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1)
+def _env_path() -> str:
+    """Return the path of the .env file in the working directory.
+
+    Resolved once per process; call _env_path.cache_clear() after
+    changing directory.
+    """
+    return os.path.join(os.getcwd(), ".env")
+
+
+def _file_key(path: str) -> Tuple[str, int, int]:
+    """Build a cache key identifying the current contents of a file.
+
+    Uses a single stat call; nanosecond mtime plus size catches
+    rewrites that land within the same coarse timestamp tick.
+
+    Args:
+        path: File path
+
+    Returns:
+        Tuple of (path, mtime in nanoseconds, size in bytes)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def _read_config(config_location: str) -> Dict[str, Any]:
+    """Read and validate the configuration file.
+
+    Args:
+        config_location: Path to the configuration file
+
+    Returns:
+        Dictionary containing configuration data
+
+    Raises:
+        ValueError: If the file is not valid UTF-8 JSON
+        SystemExit: If the configuration is invalid
+    """
+    with open(config_location, "rb") as f:
+        config = json.loads(f.read())
+
+    # Validate configuration; any error aborts, so stop at the first
+    errors = validate_config(config, fast=True)
+    if errors:
+        print("Configuration validation errors:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(
+            "\nPlease run 'python main.py configure' to fix "
+            "the configuration."
+        )
+
+    # Share one interned object per location key across all locations
+    # (json only reuses key strings within a single parse)
+    if "locations" in config:
+        config["locations"] = [
+            {sys.intern(key): value for key, value in loc.items()}
+            for loc in config["locations"]
+        ]
+
+    return config
+
+
+def load_config(force_reload: bool = False) -> Dict[str, Any]:
     """Load configuration from config.json file.
 
+    The validated configuration is cached in-process together with the
+    file's modification time and size. Later calls return the cached
+    copy, skipping parsing and validation, until the file changes.
+
+    Args:
+        force_reload: Re-read and re-validate the file even if cached
+
     Returns:
         Dictionary containing configuration data
 
     Raises:
         SystemExit: If config file not found or is invalid
     """
-    config_location = os.path.join(os.getcwd(), CONFIGURATION)
-    if not os.path.exists(config_location):
+    global _CONFIG_CACHE
+    config_location = _config_path()
+    try:
+        key = _file_key(config_location)
+    except FileNotFoundError:
         sys.exit(
             "Configuration file not found. "
             "Please run 'python main.py configure' to create one."
         )
-    try:
-        with open(config_location, "r") as f:
-            config = json.load(f)
-
-        # Validate configuration
-        errors = validate_config(config)
-        if errors:
-            print("Configuration validation errors:")
-            for error in errors:
-                print(f"  - {error}")
+    if force_reload or _CONFIG_CACHE is None or _CONFIG_CACHE[0] != key:
+        try:
+            config = _read_config(config_location)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             sys.exit(
-                "\nPlease run 'python main.py configure' to fix "
-                "the configuration."
+                "Error: Configuration file is corrupted. "
+                "Please run 'python main.py configure' to recreate it."
             )
+        _CONFIG_CACHE = (key, config)
+    # Callers mutate the config, so never hand out the cached object
+    return copy.deepcopy(_CONFIG_CACHE[1])
 
-        return config
-    except json.JSONDecodeError:
-        sys.exit(
-            "Error: Configuration file is corrupted. "
-            "Please run 'python main.py configure' to recreate it."
+
+def normalize_config(config: Dict[str, Any]) -> Config:
+    """Convert a raw configuration dictionary to a Config object.
+
+    Old single location/email configs are folded into the
+    multi-location/email format, so callers never need to branch on
+    the on-disk format.
+
+    Args:
+        config: Configuration dictionary as returned by load_config
+
+    Returns:
+        Normalized configuration
+    """
+    raw_locations = config.get("locations")
+    if raw_locations is None and "city" in config:
+        # Old single location format
+        raw_locations = [config]
+    locations = [
+        Location(
+            city=loc["city"],
+            country=loc["country"],
+            latitude=float(loc["latitude"]),
+            longitude=float(loc["longitude"]),
         )
+        for loc in raw_locations or []
+    ]
+
+    emails = config.get("emails")
+    if emails is None:
+        # Old single email format
+        emails = [config["email"]] if config.get("email") else []
+
+    return Config(
+        locations=locations,
+        emails=list(emails),
+        notification_threshold=config.get("notification_threshold", "HIGH"),
+    )
 
 
 def save_config(config: Dict[str, Any]) -> None:
@@ -162,9 +344,13 @@ def save_config(config: Dict[str, Any]) -> None:
     Args:
         config: Dictionary containing configuration data
     """
-    config_location = os.path.join(os.getcwd(), CONFIGURATION)
+    global _CONFIG_CACHE
+    config_location = _config_path()
+    content = json.dumps(config, indent=2)
     with open(config_location, "w") as f:
-        json.dump(config, f, indent=2)
+        f.write(content)
+    # Data written in-process is trusted; let load_config reuse it
+    _CONFIG_CACHE = (_file_key(config_location), copy.deepcopy(config))
 
 
 def config_exists() -> bool:
@@ -176,7 +362,7 @@ def config_exists() -> bool:
     Returns:
         True if config file exists, False otherwise
     """
-    config_location = os.path.join(os.getcwd(), CONFIGURATION)
+    config_location = _config_path()
     return os.path.exists(config_location)
 
 
@@ -224,12 +410,7 @@ def manage_locations(config: Dict[str, Any]) -> None:
     # Convert old single location format to new locations list
     if "city" in config and "locations" not in config:
         config["locations"] = [
-            {
-                "city": config.pop("city"),
-                "country": config.pop("country"),
-                "latitude": config.pop("latitude"),
-                "longitude": config.pop("longitude"),
-            }
+            {key: config.pop(key) for key in REQUIRED_LOCATION_KEYS}
         ]
 
     locations = config.get("locations", [])
@@ -257,7 +438,11 @@ def manage_locations(config: Dict[str, Any]) -> None:
             city = input("City: ")
             country = input("Country: ")
             print("\nLooking up coordinates...")
-            lat, lng = get_coordinates(city, country)
+            try:
+                lat, lng = cached_get_coordinates(city, country)
+            except GeocodingError as e:
+                print(f"Error: {e}")
+                continue
             locations.append(
                 {
                     "city": city,
@@ -321,8 +506,8 @@ def manage_emails(config: Dict[str, Any]) -> None:
     )
     emails = [email.strip() for email in email_input.split(",")]
 
-    # Validate all email addresses
-    invalid_emails = [email for email in emails if not validate_email(email)]
+    # Validate all email addresses (already stripped, so match directly)
+    invalid_emails = list(filterfalse(_EMAIL_RE.fullmatch, emails))
     if invalid_emails:
         print(
             f"\nError: Invalid email address(es): "
@@ -393,12 +578,14 @@ def configure_smtp() -> None:
     smtp_password = input("SMTP Password (or app-specific password): ")
 
     # Create/update .env file
-    env_path = os.path.join(os.getcwd(), ".env")
-    with open(env_path, "w") as f:
-        f.write(f"SMTP_SERVER={smtp_server}\n")
-        f.write(f"SMTP_PORT={smtp_port}\n")
-        f.write(f"SMTP_USERNAME={smtp_username}\n")
-        f.write(f"SMTP_PASSWORD={smtp_password}\n")
+    content = (
+        f"SMTP_SERVER={smtp_server}\n"
+        f"SMTP_PORT={smtp_port}\n"
+        f"SMTP_USERNAME={smtp_username}\n"
+        f"SMTP_PASSWORD={smtp_password}\n"
+    )
+    with open(_env_path(), "w") as f:
+        f.write(content)
 
     print("\nSMTP settings saved to .env file!")
     print("Note: .env file contains sensitive credentials and is gitignored.")
@@ -428,7 +615,11 @@ def setup_complete_config() -> Dict[str, Any]:
         city = input("Enter city: ")
         country = input("Enter country: ")
         print("\nLooking up coordinates...")
-        lat, lng = get_coordinates(city, country)
+        try:
+            lat, lng = cached_get_coordinates(city, country)
+        except GeocodingError as e:
+            print(f"Error: {e}")
+            continue
         config["locations"].append(
             {
                 "city": city,
@@ -450,10 +641,8 @@ def setup_complete_config() -> Dict[str, Any]:
         )
         emails = [email.strip() for email in email_input.split(",")]
 
-        # Validate all email addresses
-        invalid_emails = [
-            email for email in emails if not validate_email(email)
-        ]
+        # Validate all email addresses (already stripped, so match directly)
+        invalid_emails = list(filterfalse(_EMAIL_RE.fullmatch, emails))
         if invalid_emails:
             print(
                 f"Error: Invalid email address(es): "
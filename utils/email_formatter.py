@@ -1,147 +1,207 @@
-"""Email formatting utilities using Rich for beautiful emails."""
+"""Email formatting utilities for alert and test emails."""
 
-from typing import List, Dict, Any, Tuple
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
+import functools
+from html import escape
+from string import Template
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from io import StringIO
 
+from utils.config import Location
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.style import Style
+    from rich.table import Table
+
+
+_CELL_STYLE = "border: 1px solid #1565c0; padding: 6px 10px;"
+
+# Alert HTML, filled with one _ALERT_ROW_TEMPLATE per location
+_ALERT_HTML_TEMPLATE = Template(
+    '<!DOCTYPE html>\n'
+    '<html>\n<head><meta charset="UTF-8"></head>\n'
+    '<body style="font-family: Arial, sans-serif; color: #222;">\n'
+    '<div style="border: 2px solid #2e7d32; padding: 16px; '
+    'text-align: center;">\n'
+    '<h1 style="color: #00838f; margin: 0;">'
+    '🌌 Aurora Borealis Alert 🌌</h1>\n'
+    '</div>\n'
+    '<p style="text-align: center; color: #2e7d32; font-weight: bold;">'
+    'Great news! High visibility auroras detected!</p>\n'
+    '<table style="border-collapse: collapse; margin: 0 auto;">\n'
+    '<caption style="font-weight: bold; padding: 8px;">'
+    '🎆 High Visibility Locations</caption>\n'
+    '<tr style="color: #00838f;">'
+    f'<th style="{_CELL_STYLE}">📍 Location</th>'
+    f'<th style="{_CELL_STYLE}">🗺️ Coordinates</th>'
+    f'<th style="{_CELL_STYLE}">⚡ KP Index</th></tr>\n'
+    '$rows'
+    '</table>\n'
+    '<div style="border: 1px solid #1565c0; padding: 12px; '
+    'margin-top: 16px; font-weight: bold;">'
+    'Get outside and look up at the sky! '
+    'Tonight could be spectacular! ✨</div>\n'
+    '<p style="text-align: center; color: #777; font-style: italic;">'
+    'Automated notification from Northern Lights Tracker</p>\n'
+    '</body>\n</html>\n'
+)
+
+_ALERT_ROW_TEMPLATE = (
+    '<tr><td style="{cell} color: #00838f;">{location}</td>'
+    '<td style="{cell} color: #777; text-align: center;">{coords}</td>'
+    '<td style="{cell} color: #2e7d32; font-weight: bold; '
+    'text-align: center;">{kp}</td></tr>\n'
+)
+
+# Rich is only needed for the test email, and importing it is slow, so
+# it is imported on first use rather than at module import
+
+
+@functools.lru_cache(maxsize=1)
+def _test_styles() -> Tuple["Style", "Style", "Style", "Style"]:
+    """Build the test email styles (bold cyan, cyan, blue, dim).
+
+    Style objects let rendering skip Style.parse lookups.
+    """
+    from rich.style import Style
 
-def create_aurora_alert_email(
-    high_visibility_locations: List[Tuple[Dict[str, Any], float]]
-) -> Tuple[str, str]:
-    """Create a simple formatted aurora alert email.
+    return (
+        Style(color="cyan", bold=True),
+        Style(color="cyan"),
+        Style(color="blue"),
+        Style(dim=True),
+    )
 
-    Args:
-        high_visibility_locations: List of (location_dict, kp_value) tuples
 
-    Returns:
-        Tuple of (plain_text_body, html_body)
+@functools.lru_cache(maxsize=1)
+def _test_panels() -> Tuple["Panel", "Panel"]:
+    """Build the static header and info panels of the test email.
+
+    Rich does not mutate them when printing, so every email can reuse
+    the same objects.
     """
-    # Create Rich console for rendering
-    console = Console(
+    from rich.panel import Panel
+    from rich.text import Text
+
+    bold_cyan, _, blue, _ = _test_styles()
+    header_panel = Panel(
+        Text(
+            "Northern Lights Email Test",
+            style=bold_cyan,
+            justify="center"
+        ),
+        style=blue,
+        border_style=blue,
+        padding=(1, 2)
+    )
+    info_panel = Panel(
+        "You will receive alerts when aurora visibility is HIGH\n"
+        "(KP index ≥ 5.0) at any monitored location.",
+        title="[bold]ℹ️  Alert Settings[/bold]",
+        style=blue,
+        border_style=blue
+    )
+    return header_panel, info_panel
+
+
+def _new_console() -> "Console":
+    """Create a recording console for rendering an email."""
+    from rich.console import Console
+
+    return Console(
         file=StringIO(),
         record=True,
         force_terminal=True,
         width=80
     )
 
-    # Header with emoji
-    console.print()
-    header = Text(
-        "🌌 Aurora Borealis Alert 🌌",
-        style="bold cyan",
-        justify="center"
-    )
-    console.print(
-        Panel(
-            header,
-            style="green",
-            border_style="green",
-            padding=(1, 2)
-        )
-    )
-    console.print()
 
-    # Main message
-    console.print(
-        "[bold green]Great news! High visibility "
-        "auroras detected![/bold green]",
-        justify="center"
-    )
-    console.print()
+def _new_test_table() -> "Table":
+    """Create an empty monitoring locations table with its columns.
 
-    # Create table for locations
+    Tables accumulate rows, so a fresh one is needed per email.
+    """
+    from rich.table import Table
+
+    bold_cyan, cyan, blue, dim = _test_styles()
     table = Table(
-        title="[bold]🎆 High Visibility Locations[/bold]",
+        title="[bold]📍 Monitoring Locations[/bold]",
         show_header=True,
-        header_style="bold cyan",
-        border_style="blue",
-        title_style="bold",
+        header_style=bold_cyan,
+        border_style=blue,
         show_lines=True
     )
-    table.add_column("📍 Location", style="cyan", no_wrap=False)
-    table.add_column("🗺️  Coordinates", style="dim", justify="center")
-    table.add_column(
-        "⚡ KP Index",
-        style="bold green",
-        justify="center"
-    )
+    table.add_column("City", style=cyan, no_wrap=False)
+    table.add_column("Country", style=cyan)
+    table.add_column("Coordinates", style=dim, justify="center")
+    return table
 
-    for loc, kp in high_visibility_locations:
-        coords = f"{loc['latitude']:.4f}°, {loc['longitude']:.4f}°"
-        table.add_row(
-            f"{loc['city']}, {loc['country']}",
-            coords,
-            f"[bold]{kp}[/bold]"
-        )
 
-    console.print(table)
-    console.print()
+def create_aurora_alert_email(
+    high_visibility_locations: List[Tuple[Location, float]],
+    html: bool = True
+) -> Tuple[str, Optional[str]]:
+    """Create a simple formatted aurora alert email.
 
-    # Call to action
-    console.print(
-        Panel(
-            "[bold]Get outside and look up at the sky! "
-            "Tonight could be spectacular! ✨[/bold]",
-            style="blue",
-            border_style="blue"
-        )
-    )
-    console.print()
+    The HTML body is filled from a fixed template; only the location
+    rows vary between alerts.
 
-    # Footer
-    console.print(
-        "[dim italic]Automated notification from "
-        "Northern Lights Tracker[/dim italic]",
-        justify="center"
-    )
-    console.print()
-
-    # Get HTML export
-    html_body = console.export_html(inline_styles=True)
+    Args:
+        high_visibility_locations: List of (location, kp_value) tuples
+        html: Whether to build the HTML body as well
 
+    Returns:
+        Tuple of (plain_text_body, html_body); html_body is None when
+        html is False
+    """
     # Create plain text version
     plain_text = _create_plain_text_alert(high_visibility_locations)
+    if not html:
+        return plain_text, None
+
+    rows = "".join(
+        _ALERT_ROW_TEMPLATE.format(
+            cell=_CELL_STYLE,
+            location=escape(f"{loc.city}, {loc.country}"),
+            coords=f"{loc.latitude:.4f}°, {loc.longitude:.4f}°",
+            kp=kp,
+        )
+        for loc, kp in high_visibility_locations
+    )
+    html_body = _ALERT_HTML_TEMPLATE.substitute(rows=rows)
 
     return plain_text, html_body
 
 
 def create_test_email(
-    locations: List[Dict[str, Any]]
-) -> Tuple[str, str]:
+    locations: List[Location],
+    html: bool = True
+) -> Tuple[str, Optional[str]]:
     """Create a simple formatted test email.
 
+    Rendering and exporting the HTML is the costly part, so it is
+    skipped entirely (Rich is not even imported) when html is False.
+
     Args:
-        locations: List of location dictionaries
+        locations: List of configured locations
+        html: Whether to build the HTML body as well
 
     Returns:
-        Tuple of (plain_text_body, html_body)
+        Tuple of (plain_text_body, html_body); html_body is None when
+        html is False
     """
-    # Create Rich console for rendering
-    console = Console(
-        file=StringIO(),
-        record=True,
-        force_terminal=True,
-        width=80
-    )
+    # Create plain text version
+    plain_text = _create_plain_text_test(locations)
+    if not html:
+        return plain_text, None
+
+    console = _new_console()
+    header_panel, info_panel = _test_panels()
 
     # Header
     console.print()
-    header = Text(
-        "Northern Lights Email Test",
-        style="bold cyan",
-        justify="center"
-    )
-    console.print(
-        Panel(
-            header,
-            style="blue",
-            border_style="blue",
-            padding=(1, 2)
-        )
-    )
+    console.print(header_panel)
     console.print()
 
     # Success message
@@ -152,34 +212,16 @@ def create_test_email(
     console.print()
 
     # Location table
-    table = Table(
-        title="[bold]📍 Monitoring Locations[/bold]",
-        show_header=True,
-        header_style="bold cyan",
-        border_style="blue",
-        show_lines=True
-    )
-    table.add_column("City", style="cyan", no_wrap=False)
-    table.add_column("Country", style="cyan")
-    table.add_column("Coordinates", style="dim", justify="center")
-
+    table = _new_test_table()
     for loc in locations:
-        coords = f"{loc['latitude']:.4f}°, {loc['longitude']:.4f}°"
-        table.add_row(loc['city'], loc['country'], coords)
+        coords = f"{loc.latitude:.4f}°, {loc.longitude:.4f}°"
+        table.add_row(loc.city, loc.country, coords)
 
     console.print(table)
     console.print()
 
     # Info panel
-    console.print(
-        Panel(
-            "You will receive alerts when aurora visibility is HIGH\n"
-            "(KP index ≥ 5.0) at any monitored location.",
-            title="[bold]ℹ️  Alert Settings[/bold]",
-            style="blue",
-            border_style="blue"
-        )
-    )
+    console.print(info_panel)
     console.print()
 
     # Footer
@@ -192,82 +234,82 @@ def create_test_email(
     # Get HTML export
     html_body = console.export_html(inline_styles=True)
 
-    # Create plain text version
-    plain_text = _create_plain_text_test(locations)
-
     return plain_text, html_body
 
 
 def _create_plain_text_alert(
-    high_visibility_locations: List[Tuple[Dict[str, Any], float]]
+    high_visibility_locations: List[Tuple[Location, float]]
 ) -> str:
     """Create plain text version of aurora alert.
 
     Args:
-        high_visibility_locations: List of (location_dict, kp_value) tuples
+        high_visibility_locations: List of (location, kp_value) tuples
 
     Returns:
         Plain text email body
     """
-    lines = [
-        "Aurora Borealis Visibility Alert",
-        "=" * 50,
-        "",
-        "Great chance to see auroras tonight!",
-        "",
-        "High Visibility Locations:",
-        ""
-    ]
+    buf = StringIO()
+    write = buf.write
+    write(
+        "Aurora Borealis Visibility Alert\n"
+        + "=" * 50 + "\n"
+        "\n"
+        "Great chance to see auroras tonight!\n"
+        "\n"
+        "High Visibility Locations:\n"
+        "\n"
+    )
 
     for loc, kp in high_visibility_locations:
-        lines.append(f"📍 {loc['city']}, {loc['country']}")
-        lines.append(
-            f"   Coordinates: {loc['latitude']:.4f}, "
-            f"{loc['longitude']:.4f}"
+        write(
+            f"📍 {loc.city}, {loc.country}\n"
+            f"   Coordinates: {loc.latitude:.4f}, {loc.longitude:.4f}\n"
+            f"   KP Index: {kp}\n"
+            "\n"
         )
-        lines.append(f"   KP Index: {kp}")
-        lines.append("")
 
-    lines.extend([
-        "Get outside and look up! 🌌",
-        "",
+    write(
+        "Get outside and look up! 🌌\n"
+        "\n"
         "This is an automated notification from Northern Lights tracker."
-    ])
+    )
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def _create_plain_text_test(locations: List[Dict[str, Any]]) -> str:
+def _create_plain_text_test(locations: List[Location]) -> str:
     """Create plain text version of test email.
 
     Args:
-        locations: List of location dictionaries
+        locations: List of configured locations
 
     Returns:
         Plain text email body
     """
-    lines = [
-        "Northern Lights - Email Test",
-        "=" * 50,
-        "",
-        "✓ SMTP Configuration Test Successful!",
-        "",
-        "Configured Locations:",
-        ""
-    ]
+    buf = StringIO()
+    write = buf.write
+    write(
+        "Northern Lights - Email Test\n"
+        + "=" * 50 + "\n"
+        "\n"
+        "✓ SMTP Configuration Test Successful!\n"
+        "\n"
+        "Configured Locations:\n"
+    )
 
     for loc in locations:
-        lines.append(f"  • {loc['city']}, {loc['country']}")
-        lines.append(
-            f"    {loc['latitude']:.4f}, {loc['longitude']:.4f}"
+        write(
+            f"\n  • {loc.city}, {loc.country}\n"
+            f"    {loc.latitude:.4f}, {loc.longitude:.4f}"
         )
 
-    lines.extend([
-        "",
+    write(
+        "\n"
+        "\n"
         "You will receive aurora alerts when the KP index reaches "
-        "5.0 or higher.",
-        "",
+        "5.0 or higher.\n"
+        "\n"
         "This is a test email from Northern Lights tracker."
-    ])
+    )
 
-    return "\n".join(lines)
+    return buf.getvalue()
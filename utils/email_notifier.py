@@ -1,8 +1,13 @@
 """Email notification utilities."""
 
+import atexit
 import os
 import smtplib
-from typing import Optional
+import threading
+import time
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
+from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -11,8 +16,200 @@ from utils.logger import get_logger
 
 logger = get_logger("email_notifier")
 
+# Idle time (seconds) after which a pooled connection is checked with
+# NOOP before reuse; back-to-back sends skip the extra round trip
+SMTP_IDLE_CHECK = 10
 
-def send_email(
+# A batch is abandoned once this many of its sends fail (at least 10,
+# or a third of the batch), on the assumption that the rest would too
+MIN_BATCH_FAILURES = 10
+
+
+class _SMTPSession:
+    """Process-wide SMTP connection shared by every send.
+
+    Connecting, STARTTLS and login take several round trips, so the
+    authenticated connection is kept open and reused until it fails,
+    the SMTP settings change, or the process exits. Hold ``lock``
+    while calling get_server() and sending through the connection.
+    """
+
+    server: Optional[smtplib.SMTP] = None
+    key: Optional[Tuple[str, int, str]] = None
+    last_used = 0.0
+    lock = threading.Lock()
+
+    @classmethod
+    def get_server(
+        cls,
+        host: str,
+        port: int,
+        username: str,
+        password: str
+    ) -> smtplib.SMTP:
+        """Return a logged-in connection, reconnecting if needed.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            username: SMTP username
+            password: SMTP password
+
+        Returns:
+            Connected and authenticated SMTP client
+
+        Raises:
+            smtplib.SMTPException: If login or STARTTLS fails
+            OSError: If the server cannot be reached
+        """
+        key = (host, port, username)
+        if cls.server is not None and (
+            cls.key != key
+            or (
+                time.monotonic() - cls.last_used > SMTP_IDLE_CHECK
+                and not cls._is_alive(cls.server)
+            )
+        ):
+            cls.close()
+
+        if cls.server is None:
+            logger.debug("Connecting to SMTP server %s:%s", host, port)
+            server = smtplib.SMTP(host, port, timeout=30)
+            try:
+                server.starttls()
+                logger.debug("Logging in to SMTP server")
+                server.login(username, password)
+            except BaseException:
+                server.close()
+                raise
+            cls.server, cls.key = server, key
+
+        cls.last_used = time.monotonic()
+        return cls.server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        """Check whether a pooled connection still answers NOOP."""
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the pooled connection, if any."""
+        server, cls.server, cls.key = cls.server, None, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+atexit.register(_SMTPSession.close)
+
+# SMTP settings; read once at import by reload_config()
+_SMTP_SERVER: Optional[str] = None
+_SMTP_PORT = 587
+_SMTP_USERNAME: Optional[str] = None
+_SMTP_PASSWORD: Optional[str] = None
+_SMTP_CONFIGURED = False
+
+
+def reload_config(override: bool = True) -> None:
+    """Read the SMTP settings from the .env file and environment.
+
+    Runs once at import, so sends don't re-parse .env; call it again
+    after editing .env to pick up the change. Also rebinds send_email
+    to the SMTP sender, or to a stub that only logs when SMTP is not
+    configured, so sending never re-checks the settings.
+
+    Args:
+        override: Let .env values replace variables already set in the
+            environment (at import, the environment takes precedence)
+    """
+    global _SMTP_SERVER, _SMTP_PORT, _SMTP_USERNAME, _SMTP_PASSWORD
+    global _SMTP_CONFIGURED, send_email
+    load_dotenv(override=override)
+
+    _SMTP_SERVER = os.environ.get("SMTP_SERVER")
+    _SMTP_USERNAME = os.environ.get("SMTP_USERNAME")
+    _SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD")
+    port = os.environ.get("SMTP_PORT", "587")
+    try:
+        _SMTP_PORT = int(port)
+    except ValueError:
+        logger.error("Invalid SMTP_PORT %r; using 587", port)
+        _SMTP_PORT = 587
+
+    _SMTP_CONFIGURED = all([_SMTP_SERVER, _SMTP_USERNAME, _SMTP_PASSWORD])
+    send_email = _send_smtp_email if _SMTP_CONFIGURED else _log_unsent_email
+
+
+def _build_message(
+    from_email: str,
+    to_email: str,
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None
+) -> MIMEBase:
+    """Build an email message.
+
+    Plain-text-only emails are a single text/plain part; with an HTML
+    body the message is multipart/alternative with both versions.
+
+    Args:
+        from_email: Sender email address
+        to_email: Recipient email address
+        subject: Email subject
+        body: Plain text email body
+        html_body: Optional HTML version of the email body
+
+    Returns:
+        MIME message ready to send
+    """
+    if html_body:
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(body, "plain"))
+        msg.attach(MIMEText(html_body, "html"))
+        logger.debug("HTML email body attached")
+    else:
+        msg = MIMEText(body, "plain")
+    msg["From"] = from_email
+    msg["To"] = to_email
+    msg["Subject"] = subject
+
+    return msg
+
+
+def _log_unsent_email(
+    to_email: str,
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None
+) -> None:
+    """Stand-in for send_email while SMTP is not configured.
+
+    Logs what would have been sent instead of sending it.
+
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        body: Plain text email body
+        html_body: Optional HTML version of the email body (unused)
+    """
+    logger.warning(
+        "SMTP credentials not configured. "
+        "Set SMTP_SERVER, SMTP_USERNAME, and SMTP_PASSWORD "
+        "environment variables. Email not sent."
+    )
+    logger.info("Email would have been sent to %s", to_email)
+    logger.info("Subject: %s", subject)
+    logger.debug("Body:\n%s", body)
+
+
+def _send_smtp_email(
     to_email: str,
     subject: str,
     body: str,
@@ -27,65 +224,201 @@ def send_email(
         html_body: Optional HTML version of the email body
 
     Note:
-        Loads SMTP configuration from .env file or environment variables:
+        Uses the SMTP configuration read by reload_config() from the
+        .env file or environment variables:
         - SMTP_SERVER (e.g., smtp.gmail.com)
         - SMTP_PORT (e.g., 587)
         - SMTP_USERNAME
         - SMTP_PASSWORD
     """
-    # Load environment variables from .env file if it exists
-    load_dotenv()
+    try:
+        logger.debug("Preparing email to %s", to_email)
+        msg = _build_message(
+            _SMTP_USERNAME, to_email, subject, body, html_body
+        )
 
-    smtp_server = os.environ.get("SMTP_SERVER")
-    smtp_port = os.environ.get("SMTP_PORT", "587")
-    smtp_username = os.environ.get("SMTP_USERNAME")
-    smtp_password = os.environ.get("SMTP_PASSWORD")
+        with _SMTPSession.lock:
+            try:
+                server = _SMTPSession.get_server(
+                    _SMTP_SERVER, _SMTP_PORT, _SMTP_USERNAME, _SMTP_PASSWORD
+                )
+                logger.debug("Sending message")
+                server.send_message(msg)
+            except (smtplib.SMTPException, OSError):
+                # Drop a possibly broken connection; next send reconnects
+                _SMTPSession.close()
+                raise
+        logger.info("Email notification sent to %s", to_email)
+    except smtplib.SMTPAuthenticationError:
+        logger.error("SMTP authentication failed")
+    except smtplib.SMTPException as e:
+        logger.error("SMTP error: %s", e)
+    except Exception as e:
+        logger.error("Unexpected error sending email: %s", e)
 
-    if not all([smtp_server, smtp_username, smtp_password]):
-        logger.warning(
-            "SMTP credentials not configured. "
-            "Set SMTP_SERVER, SMTP_USERNAME, and SMTP_PASSWORD "
-            "environment variables."
-        )
-        logger.info(f"Email would have been sent to {to_email}")
-        logger.info(f"Subject: {subject}")
-        logger.debug(f"Body:\n{body}")
-        print(
-            "Warning: SMTP credentials not configured. "
-            "Email not sent."
-        )
+
+def send_bulk_email(
+    recipients: List[str],
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None
+) -> None:
+    """Send the same email to several recipients over one SMTP session.
+
+    Uses the shared SMTP connection (connecting, running STARTTLS and
+    logging in only if needed), then sends one message per recipient.
+    The message is built once and only its To header is swapped per
+    recipient. If the connection drops part-way through,
+    the remaining recipients are sent individually via send_email.
+
+    Args:
+        recipients: Recipient email addresses
+        subject: Email subject
+        body: Plain text email body
+        html_body: Optional HTML version of the email body
+    """
+    if not _SMTP_CONFIGURED:
+        # send_email reports the missing configuration per recipient
+        for to_email in recipients:
+            send_email(to_email, subject, body, html_body)
         return
 
+    pending = list(recipients)
+    if not pending:
+        return
     try:
-        logger.debug(f"Preparing email to {to_email}")
-        msg = MIMEMultipart("alternative")
-        msg["From"] = smtp_username
-        msg["To"] = to_email
-        msg["Subject"] = subject
+        with _SMTPSession.lock:
+            server = _SMTPSession.get_server(
+                _SMTP_SERVER, _SMTP_PORT, _SMTP_USERNAME, _SMTP_PASSWORD
+            )
+            # Encode the bodies once; only the To header varies
+            msg = _build_message(
+                _SMTP_USERNAME, pending[0], subject, body, html_body
+            )
+            while pending:
+                to_email = pending[0]
+                msg.replace_header("To", to_email)
+                try:
+                    server.sendmail(
+                        _SMTP_USERNAME, [to_email], msg.as_string()
+                    )
+                    logger.info("Email notification sent to %s", to_email)
+                except smtplib.SMTPRecipientsRefused as e:
+                    logger.error("Failed to send email to %s: %s", to_email, e)
+                pending.pop(0)
+    except smtplib.SMTPAuthenticationError:
+        logger.error("SMTP authentication failed")
+    except (smtplib.SMTPException, OSError) as e:
+        # Drop the broken connection; send_email reconnects
+        with _SMTPSession.lock:
+            _SMTPSession.close()
+        logger.warning(
+            "SMTP session failed (%s); "
+            "sending %d remaining email(s) individually",
+            e, len(pending)
+        )
+        _send_individually(pending, subject, body, html_body)
 
-        # Attach plain text version
-        msg.attach(MIMEText(body, "plain"))
 
-        # Attach HTML version if provided
-        if html_body:
-            msg.attach(MIMEText(html_body, "html"))
-            logger.debug("HTML email body attached")
-
-        logger.debug(f"Connecting to SMTP server {smtp_server}:{smtp_port}")
-        with smtplib.SMTP(smtp_server, int(smtp_port), timeout=30) as server:
-            server.starttls()
-            logger.debug("Logging in to SMTP server")
-            server.login(smtp_username, smtp_password)
-            logger.debug("Sending message")
-            server.send_message(msg)
-        logger.info(f"Email notification sent to {to_email}")
-        print(f"Email notification sent to {to_email}")
+def send_emails(
+    messages: List[Tuple[str, str, str, Optional[str]]],
+    connection: Optional[smtplib.SMTP] = None
+) -> int:
+    """Send several different emails over one SMTP session.
+
+    Each message is built and sent in turn through the same connection.
+    Refused messages are reported and skipped, but the batch is
+    abandoned once max(MIN_BATCH_FAILURES, len(messages) // 3) of them
+    have failed.
+
+    Args:
+        messages: List of (to_email, subject, body, html_body) tuples
+        connection: Logged-in SMTP connection to send through (default:
+            the shared connection)
+
+    Returns:
+        Number of emails sent
+    """
+    if not messages:
+        return 0
+
+    if not _SMTP_CONFIGURED:
+        # send_email reports the missing configuration per message
+        for message in messages:
+            send_email(*message)
+        return 0
+
+    max_failures = max(MIN_BATCH_FAILURES, len(messages) // 3)
+    sent = failed = 0
+    # A caller-supplied connection is the caller's to synchronize
+    lock = _SMTPSession.lock if connection is None else nullcontext()
+    try:
+        with lock:
+            server = connection or _SMTPSession.get_server(
+                _SMTP_SERVER, _SMTP_PORT, _SMTP_USERNAME, _SMTP_PASSWORD
+            )
+            for to_email, subject, body, html_body in messages:
+                msg = _build_message(
+                    _SMTP_USERNAME, to_email, subject, body, html_body
+                )
+                try:
+                    server.send_message(msg)
+                except (
+                    smtplib.SMTPRecipientsRefused,
+                    smtplib.SMTPSenderRefused,
+                    smtplib.SMTPDataError,
+                ) as e:
+                    failed += 1
+                    logger.error("Failed to send email to %s: %s", to_email, e)
+                    if failed >= max_failures:
+                        logger.error(
+                            "%d of %d emails failed; "
+                            "abandoning the remaining %d",
+                            failed, len(messages),
+                            len(messages) - sent - failed
+                        )
+                        break
+                    continue
+                sent += 1
+                logger.info("Email notification sent to %s", to_email)
     except smtplib.SMTPAuthenticationError:
         logger.error("SMTP authentication failed")
-        print("Warning: Failed to send email: Authentication failed")
-    except smtplib.SMTPException as e:
-        logger.error(f"SMTP error: {e}")
-        print(f"Warning: Failed to send email: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error sending email: {e}")
-        print(f"Warning: Failed to send email: {e}")
+    except (smtplib.SMTPException, OSError) as e:
+        if connection is None:
+            # Drop the broken connection; the next send reconnects
+            with _SMTPSession.lock:
+                _SMTPSession.close()
+        unsent = len(messages) - sent - failed
+        logger.error(
+            "SMTP session failed (%s); %d email(s) not sent", e, unsent
+        )
+
+    return sent
+
+
+def _send_individually(
+    recipients: List[str],
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None
+) -> None:
+    """Send one email per recipient via send_email.
+
+    Used as the fallback when a shared session fails, so one bad
+    recipient or dropped connection does not stop the others. Sends
+    are sequential since they share the pooled SMTP connection.
+
+    Args:
+        recipients: Recipient email addresses
+        subject: Email subject
+        body: Plain text email body
+        html_body: Optional HTML version of the email body
+    """
+    for to_email in recipients:
+        send_email(to_email, subject, body, html_body)
+
+
+# Public entry point for single emails, bound by reload_config(); call
+# it through this module so a later reload_config() takes effect
+send_email = _log_unsent_email
+reload_config(override=False)
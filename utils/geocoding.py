@@ -1,47 +1,409 @@
 """Geocoding utilities for converting locations to coordinates."""
 
-import sys
-from typing import Tuple
+import atexit
+import contextlib
+import functools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NoReturn, Optional, Tuple
 
+from geopy.adapters import AdapterHTTPError, RequestsAdapter
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from geopy.location import Location
+from geopy.exc import (
+    GeocoderServiceError,
+    GeocoderTimedOut,
+    GeocoderUnavailable,
+)
 
 from utils.logger import get_logger
 
 logger = get_logger("geocoding")
 
+# Coordinates rarely change, so lookups are kept across runs
+GEOCODE_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "northern_lights", "geocode.json"
+)
+GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60  # seconds; refresh after 30 days
+# Unknown locations are remembered briefly so a misspelling fails fast
+# without hitting Nominatim again while the user corrects it
+GEOCODE_NEGATIVE_TTL = 60 * 60  # seconds
 
-def get_coordinates(city: str, country: str) -> Tuple[float, float]:
-    """Get latitude and longitude for a given city and country.
+# Transient Nominatim failures (timeouts, 5xx) are retried with backoff
+GEOCODE_ATTEMPTS = 3
+GEOCODE_BACKOFF = 0.5  # seconds before the first retry, then doubled
+
+# Nominatim's usage policy allows at most one request per second
+GEOCODE_MIN_INTERVAL = 1.0
+GEOCODE_WORKERS = 4
+
+
+class GeocodingError(RuntimeError):
+    """Raised when a location cannot be geocoded."""
+
+
+# Loaded lazily from GEOCODE_CACHE; maps "city|country" to
+# {"lat": float, "lon": float, "ts": lookup time}
+_GEOCODE_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+_GEOCODE_CACHE_DIRTY = False
+_GEOCODE_CACHE_LOCK = threading.Lock()
+
+# Earliest monotonic time the next Nominatim request may start
+_NEXT_REQUEST_AT = 0.0
+_RATE_LOCK = threading.Lock()
+
+# Shared geocoder, created on first lookup; see _get_geolocator
+_GEOLOCATOR: Optional[Nominatim] = None
+
+
+def _get_geolocator() -> Nominatim:
+    """Return the shared Nominatim geocoder, creating it on first use.
+
+    Reusing one geocoder keeps its HTTP session, so successive lookups
+    reuse the pooled keep-alive connection instead of a new TLS one.
+    """
+    global _GEOLOCATOR
+    if _GEOLOCATOR is None:
+        _GEOLOCATOR = Nominatim(
+            user_agent="northern-lights-tracker",
+            timeout=10,
+            adapter_factory=functools.partial(
+                RequestsAdapter, pool_connections=4, pool_maxsize=4
+            ),
+        )
+    return _GEOLOCATOR
+
+
+def _wait_for_rate_limit() -> None:
+    """Block until another Nominatim request may start.
+
+    Each caller reserves the next free slot under the lock and sleeps
+    outside it, so concurrent lookups start GEOCODE_MIN_INTERVAL apart.
+    """
+    global _NEXT_REQUEST_AT
+    with _RATE_LOCK:
+        now = time.monotonic()
+        start = max(now, _NEXT_REQUEST_AT)
+        _NEXT_REQUEST_AT = start + GEOCODE_MIN_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+
+def _is_transient(error: GeocoderServiceError) -> bool:
+    """Check whether a geocoding failure is worth retrying.
+
+    Timeouts, connection failures and HTTP 5xx responses are retried.
+    geopy maps 503/504 to GeocoderTimedOut but 500/502 to a plain
+    GeocoderServiceError, so the underlying HTTP status is checked too.
+
+    Args:
+        error: Exception raised by the geocoder
+
+    Returns:
+        True if the request may succeed when repeated
+    """
+    if isinstance(error, (GeocoderTimedOut, GeocoderUnavailable)):
+        return True
+    cause = error.__cause__
+    return isinstance(cause, AdapterHTTPError) and cause.status_code >= 500
+
+
+def _geocode(query: str) -> Optional[Location]:
+    """Geocode a query, retrying timeouts and server errors.
+
+    Waits GEOCODE_BACKOFF seconds (doubling each time, plus up to
+    0.2s of jitter) between attempts.
+
+    Args:
+        query: Free-form location query
+
+    Returns:
+        Matched location, or None if nothing matched
+
+    Raises:
+        GeocoderTimedOut: If every attempt timed out
+        GeocoderServiceError: If the service fails with a non-transient
+            error or keeps failing
+    """
+    for attempt in range(GEOCODE_ATTEMPTS):
+        _wait_for_rate_limit()
+        try:
+            return _get_geolocator().geocode(query)
+        except GeocoderServiceError as e:
+            if attempt == GEOCODE_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            delay = GEOCODE_BACKOFF * 2 ** attempt + random.uniform(0, 0.2)
+            logger.warning(
+                "Geocoding attempt %d failed (%s); retrying in %.1fs",
+                attempt + 1, e, delay
+            )
+            time.sleep(delay)
+
+
+def _location_not_found(city: str, country: str) -> NoReturn:
+    """Report a location Nominatim does not know.
+
+    Args:
+        city: City name
+        country: Country name
+
+    Raises:
+        GeocodingError: Always
+    """
+    logger.error("Location not found: %s, %s", city, country)
+    raise GeocodingError(
+        f"Could not find location for '{city}, {country}'. "
+        "Please check the spelling."
+    )
+
+
+def _find_coordinates(
+    city: str,
+    country: str
+) -> Optional[Tuple[float, float]]:
+    """Look up a city and country with Nominatim.
 
     Args:
         city: City name
         country: Country name
 
     Returns:
-        Tuple of (latitude, longitude)
+        Tuple of (latitude, longitude), or None if nothing matched
 
     Raises:
-        SystemExit: If geocoding fails
+        GeocodingError: If the geocoding service fails
     """
     try:
-        logger.debug(f"Looking up coordinates for {city}, {country}")
-        geolocator = Nominatim(user_agent="northern-lights-tracker")
-        location = geolocator.geocode(f"{city}, {country}", timeout=10)
+        logger.debug("Looking up coordinates for %s, %s", city, country)
+        location = _geocode(f"{city}, {country}")
         if location is None:
-            logger.error(f"Location not found: {city}, {country}")
-            sys.exit(
-                f"Error: Could not find location for '{city}, {country}'. "
-                "Please check the spelling."
-            )
+            return None
         logger.info(
-            f"Found coordinates for {city}, {country}: "
-            f"{location.latitude}, {location.longitude}"
+            "Found coordinates for %s, %s: %s, %s",
+            city, country, location.latitude, location.longitude
         )
         return location.latitude, location.longitude
-    except GeocoderTimedOut:
+    except GeocoderTimedOut as e:
         logger.error("Geocoding service timed out")
-        sys.exit("Error: Geocoding service timed out. Please try again.")
+        raise GeocodingError(
+            "Geocoding service timed out. Please try again."
+        ) from e
     except GeocoderServiceError as e:
-        logger.error(f"Geocoding service error: {e}")
-        sys.exit(f"Error: Geocoding service failed: {e}")
+        logger.error("Geocoding service error: %s", e)
+        raise GeocodingError(f"Geocoding service failed: {e}") from e
+
+
+def get_coordinates(city: str, country: str) -> Tuple[float, float]:
+    """Get latitude and longitude for a given city and country.
+
+    Args:
+        city: City name
+        country: Country name
+
+    Returns:
+        Tuple of (latitude, longitude)
+
+    Raises:
+        GeocodingError: If geocoding fails
+    """
+    coordinates = _find_coordinates(city, country)
+    if coordinates is None:
+        _location_not_found(city, country)
+    return coordinates
+
+
+def _geocode_cache() -> Dict[str, Dict[str, Any]]:
+    """Return the persistent geocoding cache, loading it on first use.
+
+    Must be called with _GEOCODE_CACHE_LOCK held.
+
+    Returns:
+        Mapping of "city|country" keys to {"lat", "lon", "ts"} entries
+        (lat and lon are None for locations that were not found)
+    """
+    global _GEOCODE_CACHE
+    if _GEOCODE_CACHE is None:
+        try:
+            with open(GEOCODE_CACHE, "r") as f:
+                _GEOCODE_CACHE = json.load(f)
+            if not isinstance(_GEOCODE_CACHE, dict):
+                _GEOCODE_CACHE = {}
+        except (OSError, ValueError):
+            _GEOCODE_CACHE = {}
+    return _GEOCODE_CACHE
+
+
+def _save_geocode_cache() -> None:
+    """Write the geocoding cache to disk if new lookups were added.
+
+    The cache is written to a unique temp file and moved into place,
+    so concurrent runs never read or publish a partial cache.
+    """
+    with _GEOCODE_CACHE_LOCK:
+        if not _GEOCODE_CACHE_DIRTY or _GEOCODE_CACHE is None:
+            return
+        cache_dir = os.path.dirname(GEOCODE_CACHE)
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # A unique temp file, so overlapping runs never share one
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(_GEOCODE_CACHE, f)
+            os.replace(tmp_path, GEOCODE_CACHE)
+        except OSError as e:
+            logger.warning("Could not save geocoding cache: %s", e)
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+
+atexit.register(_save_geocode_cache)
+
+
+@dataclass(frozen=True)
+class _Place:
+    """A city/country pair as typed, compared by its cache key.
+
+    Equality and hashing use only the normalized key, so lru_cache and
+    deduplication treat "Oslo" and " oslo" as the same place, while
+    lookups and messages keep the user's spelling.
+    """
+
+    key: Tuple[str, str]
+    city: str = field(compare=False)
+    country: str = field(compare=False)
+
+    @classmethod
+    def of(cls, city: str, country: str) -> "_Place":
+        """Build a place, normalizing its key case-insensitively."""
+        city, country = city.strip(), country.strip()
+        return cls((city.lower(), country.lower()), city, country)
+
+
+def _lookup_geocode_cache(place: _Place) -> Optional[Tuple[float, float]]:
+    """Return unexpired coordinates from the disk cache, if any.
+
+    Args:
+        place: Place to look up
+
+    Returns:
+        Tuple of (latitude, longitude), or None on a miss
+
+    Raises:
+        GeocodingError: If the location was recently not found
+    """
+    city, country = place.city, place.country
+    with _GEOCODE_CACHE_LOCK:
+        entry = _geocode_cache().get("|".join(place.key))
+    if not isinstance(entry, dict):
+        return None
+    age = time.time() - entry.get("ts", 0)
+    if entry.get("lat") is None:
+        if age < GEOCODE_NEGATIVE_TTL:
+            logger.debug("Location recently not found: %s, %s", city, country)
+            _location_not_found(city, country)
+        return None
+    if age < GEOCODE_CACHE_TTL:
+        logger.debug("Using cached coordinates for %s, %s", city, country)
+        return entry["lat"], entry["lon"]
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_coordinates(place: _Place) -> Tuple[float, float]:
+    """Look up a place, consulting the disk cache first.
+
+    Disk entries older than GEOCODE_CACHE_TTL are looked up again.
+    Locations that are not found are cached too, for
+    GEOCODE_NEGATIVE_TTL, so repeating a misspelling fails fast.
+
+    Args:
+        place: Place to look up
+
+    Returns:
+        Tuple of (latitude, longitude)
+
+    Raises:
+        GeocodingError: If geocoding fails
+    """
+    global _GEOCODE_CACHE_DIRTY
+    cached = _lookup_geocode_cache(place)
+    if cached is not None:
+        return cached
+
+    coordinates = _find_coordinates(place.city, place.country)
+    lat, lng = coordinates if coordinates is not None else (None, None)
+    with _GEOCODE_CACHE_LOCK:
+        _geocode_cache()["|".join(place.key)] = {
+            "lat": lat, "lon": lng, "ts": time.time()
+        }
+        _GEOCODE_CACHE_DIRTY = True
+    if coordinates is None:
+        _location_not_found(place.city, place.country)
+    return coordinates
+
+
+def cached_get_coordinates(city: str, country: str) -> Tuple[float, float]:
+    """Get coordinates for a city and country, reusing earlier lookups.
+
+    Lookups are keyed case-insensitively and cached both in memory and
+    in GEOCODE_CACHE (written at exit), so re-adding a location does
+    not repeat the Nominatim request until the entry expires.
+
+    Args:
+        city: City name
+        country: Country name
+
+    Returns:
+        Tuple of (latitude, longitude)
+
+    Raises:
+        GeocodingError: If geocoding fails
+    """
+    return _cached_coordinates(_Place.of(city, country))
+
+
+def get_coordinates_many(
+    pairs: List[Tuple[str, str]]
+) -> List[Tuple[float, float]]:
+    """Get coordinates for several city/country pairs at once.
+
+    Pairs are deduplicated case-insensitively and cached ones are
+    answered locally. The rest are looked up on GEOCODE_WORKERS
+    threads, which still start at most one Nominatim request per
+    GEOCODE_MIN_INTERVAL.
+
+    Args:
+        pairs: List of (city, country) tuples
+
+    Returns:
+        List of (latitude, longitude) tuples, in the order of pairs
+
+    Raises:
+        GeocodingError: If geocoding fails
+    """
+    places = [_Place.of(city, country) for city, country in pairs]
+    results: Dict[_Place, Tuple[float, float]] = {}
+    missing = []
+    for place in dict.fromkeys(places):
+        cached = _lookup_geocode_cache(place)
+        if cached is None:
+            missing.append(place)
+        else:
+            results[place] = cached
+
+    if missing:
+        workers = min(GEOCODE_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results.update(
+                zip(missing, executor.map(_cached_coordinates, missing))
+            )
+
+    return [results[place] for place in places]
@@ -1,8 +1,75 @@
 """Logging utilities for Northern Lights."""
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# Loggers already handed out by get_logger, keyed by name
+_LOGGERS: Dict[Optional[str], logging.Logger] = {}
+
+# Writes queued records; started by setup_logger, see flush_logs
+_LISTENER: Optional[QueueListener] = None
+
+
+class _WorkerQueueHandler(QueueHandler):
+    """Queue records from worker threads, write main-thread ones inline.
+
+    The CLI reports progress with print() on the main thread, so its
+    own records are written synchronously to stay in order with that
+    output. Only worker threads (concurrent fetches, sends, lookups)
+    hand their records to the background listener.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.SimpleQueue,
+        handler: logging.Handler
+    ) -> None:
+        super().__init__(log_queue)
+        self._handler = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write the record now on the main thread, else enqueue it."""
+        if threading.current_thread() is threading.main_thread():
+            if record.levelno >= self._handler.level:
+                self._handler.handle(record)
+        else:
+            super().emit(record)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp within a second.
+
+    With a date format of whole-second resolution every record in the
+    same second gets the same timestamp, so strftime runs at most once
+    per second instead of once per record.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # (second, formatted timestamp), replaced as a single tuple
+        self._last_time: Tuple[int, str] = (-1, "")
+
+    def formatTime(
+        self,
+        record: logging.LogRecord,
+        datefmt: Optional[str] = None
+    ) -> str:
+        """Format the record's creation time, reusing the last result."""
+        if not datefmt:
+            # The default format includes milliseconds
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        last_second, last_str = self._last_time
+        if second != last_second:
+            last_str = time.strftime(datefmt, self.converter(second))
+            self._last_time = (second, last_str)
+        return last_str
 
 
 def setup_logger(
@@ -20,35 +87,65 @@ def setup_logger(
     """
     logger = logging.getLogger(name)
 
-    # Only add handler if not already configured
-    if not logger.handlers:
-        logger.setLevel(level)
+    # Already set up by an earlier call (or configured elsewhere)
+    if getattr(logger, "_nl_configured", False) or logger.handlers:
+        return logger
 
-        # Console handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setLevel(level)
+    logger.setLevel(level)
 
-        # Format: time - level - message
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
+    # Console handler
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(level)
 
-        logger.addHandler(handler)
+    # Format: time - level - message
+    formatter = _CachedTimeFormatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    handler.setFormatter(formatter)
 
+    # Worker threads' records are queued and written by a background
+    # thread, so they never block on stdout; stopping the listener at
+    # exit flushes whatever is still queued
+    global _LISTENER
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_WorkerQueueHandler(log_queue, handler))
+    _LISTENER = QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _LISTENER.start()
+    atexit.register(_LISTENER.stop)
+
+    logger._nl_configured = True
     return logger
 
 
+def flush_logs() -> None:
+    """Write out every log record queued by worker threads.
+
+    Call before printing output that must follow those records.
+    """
+    if _LISTENER is not None:
+        # stop() drains the queue and joins the thread; start a new one
+        _LISTENER.stop()
+        _LISTENER.start()
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Get or create a logger.
 
+    Loggers are kept in _LOGGERS by name, so repeat calls are a single
+    dict lookup, skipping the name formatting and the logging module's
+    lock.
+
     Args:
         name: Logger name (default: use root northern_lights logger)
 
     Returns:
         Logger instance
     """
-    if name:
-        return logging.getLogger(f"northern_lights.{name}")
-    return logging.getLogger("northern_lights")
+    logger = _LOGGERS.get(name)
+    if logger is None:
+        full_name = f"northern_lights.{name}" if name else "northern_lights"
+        logger = _LOGGERS.setdefault(name, logging.getLogger(full_name))
+    return logger